@@ -9,7 +9,21 @@ import streamlit as st
 from datetime import datetime
 import time
 import math
+import uuid
+import io
+import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.colors import LinearSegmentedColormap
+
+from scoring import (
+    CATEGORIES, DAYS, DURATION_OPTIONS, ENERGY_LEVELS, MOOD_LEVELS, PROCRASTINATION_LEVELS,
+    score_grid,
+)
+from planner import TASK_COLUMNS, default_slots, plan_week
+from model import load_model, predict_grid
+from explain import ForestExplainer, explain_task
+from forecast import USER_ID, forecast_path, load_forecaster, save_forecaster
 
 st.set_page_config(page_title="Prodawn — Productivity Predictor", layout="wide", initial_sidebar_state="collapsed")
 
@@ -267,35 +281,83 @@ input[type="number"]:focus, input[type="text"]:focus, textarea:focus, select:foc
 st.markdown(f"<style>{CSS}</style>", unsafe_allow_html=True)
 
 # ---------------------------
-# Helper: compute productivity score (simple heuristic)
+# Trained model (optional): used instead of the heuristic once `python model.py task_log.csv` has run
+# ---------------------------
+@st.cache_resource(show_spinner=False)
+def load_model_and_columns():
+    return load_model()
+
+model, X_columns = load_model_and_columns()
+SCORE_SOURCE = "trained model" if model is not None else "heuristic"
+
+
+@st.cache_resource(show_spinner=False)
+def load_explainer():
+    return ForestExplainer(model, X_columns) if model is not None else None
+
+explainer = load_explainer()
+
+
+@st.cache_data(show_spinner=False)
+def explain_input(duration, procrastination, energy, mood, category, day, note):
+    """(score, field names, contributions in score points) for one form input (cached)."""
+    return explain_task(explainer, duration, procrastination, energy, mood, category, day, note)
+
+# Per-user forecast state is saved to a file per user id; the id travels in the page link
+# (?user=...), so reloading or bookmarking the page keeps the history. Every prediction / logged
+# outcome updates it in O(1). Logged outcomes count fully; a prediction is only a guess, so it
+# counts for PREDICTION_WEIGHT of a record, and resubmitting the same inputs (e.g. while trying
+# what-ifs) is not recorded again.
+PREDICTION_WEIGHT = 0.25
+user_id = st.query_params.get("user", "")
+if not USER_ID.fullmatch(user_id):
+    user_id = uuid.uuid4().hex
+    st.query_params["user"] = user_id
+forecaster_path = forecast_path(user_id)
+forecaster = load_forecaster(forecaster_path)
+
 # ---------------------------
-def compute_score(duration, procrastination, energy, mood, category):
-    score = 55
-    if duration <= 15:
-        score += 14
-    elif duration <= 30:
-        score += 10
-    elif duration <= 60:
-        score += 4
-    elif duration <= 120:
-        score -= 4
+# What-if heatmap: score every duration x energy x mood in one vectorized sweep
+# ---------------------------
+WHATIF_CMAP = LinearSegmentedColormap.from_list(
+    "prodawn_soft", [BAD_COLOR_ACCENT, OK_COLOR_ACCENT, GOOD_COLOR_ACCENT]
+)
+
+
+@st.cache_data(show_spinner=False)
+def whatif_heatmap(procrastination, category, day, note):
+    """Render the what-if grid as PNG bytes (cached).
+
+    Scored by the trained model when one is loaded, so it agrees with the prediction
+    above it; the heuristic ignores day and note.
+    """
+    if model is not None:
+        grid = predict_grid(model, X_columns, procrastination, category, day, note)
     else:
-        score -= 12
-    if procrastination == "Low":
-        score += 16
-    elif procrastination == "High":
-        score -= 18
-    if energy == "High":
-        score += 12
-    elif energy == "Low":
-        score -= 10
-    if mood == "Good":
-        score += 8
-    elif mood == "Bad":
-        score -= 6
-    if category == "Creative" and mood == "Good":
-        score += 4
-    return max(0, min(100, int(score)))
+        grid = score_grid(procrastination, category)
+    table = grid.reshape(len(DURATION_OPTIONS), -1)
+    col_labels = [f"{e} / {m}" for e in ENERGY_LEVELS for m in MOOD_LEVELS]
+
+    fig, ax = plt.subplots(figsize=(7.0, 4.2), dpi=100)
+    ax.imshow(table, cmap=WHATIF_CMAP, vmin=0, vmax=100, aspect="auto")
+    ax.set_xticks(range(len(col_labels)))
+    ax.set_xticklabels(col_labels, rotation=35, ha="right", fontsize=8, color="#7f6f66")
+    ax.set_yticks(range(len(DURATION_OPTIONS)))
+    ax.set_yticklabels([f"{d} min" for d in DURATION_OPTIONS], fontsize=8, color="#7f6f66")
+    ax.set_xlabel("Energy / Mood", fontsize=9, color="#7f6f66")
+    for (i, j), v in np.ndenumerate(table):
+        ax.text(j, i, f"{v}", ha="center", va="center", fontsize=7, color="#4e3f36")
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    plt.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    plt.close(fig)
+
+    best = np.unravel_index(np.argmax(grid), grid.shape)
+    best_label = f"{DURATION_OPTIONS[best[0]]} min · {ENERGY_LEVELS[best[1]]} energy · {MOOD_LEVELS[best[2]]} mood"
+    return buf.getvalue(), best_label, int(grid[best])
 
 # ---------------------------
 # Header HTML
@@ -341,19 +403,19 @@ with left_col:
         duration = st.number_input('', min_value=1, max_value=24*60, value=60, step=5, key="duration")
 
         st.markdown('<div class="field-label">🕰️ Procrastination Level</div>', unsafe_allow_html=True)
-        procrastination = st.selectbox('', ["Low", "Medium", "High"], index=1, key="procrastination")
+        procrastination = st.selectbox('', PROCRASTINATION_LEVELS, index=1, key="procrastination")
 
         st.markdown('<div class="field-label">⚡ Energy Level</div>', unsafe_allow_html=True)
-        energy = st.selectbox('', ["Low", "Medium", "High"], index=1, key="energy")
+        energy = st.selectbox('', ENERGY_LEVELS, index=1, key="energy")
 
         st.markdown('<div class="field-label">😊 Mood Level</div>', unsafe_allow_html=True)
-        mood = st.selectbox('', ["Bad", "Okay", "Good"], index=2, key="mood")
+        mood = st.selectbox('', MOOD_LEVELS, index=2, key="mood")
 
         st.markdown('<div class="field-label">🏷️ Task Category</div>', unsafe_allow_html=True)
-        category = st.selectbox('', ["Work", "Study", "Personal", "Errand", "Creative"], index=0, key="category")
+        category = st.selectbox('', CATEGORIES, index=0, key="category")
 
         st.markdown('<div class="field-label">📅 Day of the Week</div>', unsafe_allow_html=True)
-        day = st.selectbox('', ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"], index=datetime.now().weekday(), key="day")
+        day = st.selectbox('', DAYS, index=datetime.now().weekday(), key="day")
 
         st.markdown('<div class="field-label">✍️ Quick note (optional)</div>', unsafe_allow_html=True)
         note = st.text_input('', placeholder="One-sentence goal or subtask", key="note")
@@ -385,7 +447,12 @@ if submitted:
     with st.spinner("Generating report..."):
         time.sleep(0.7)
 
-    score = compute_score(duration, procrastination, energy, mood, category)
+    score, comp_names, components = explain_input(duration, procrastination, energy, mood, category, day, note)
+    submitted_input = (duration, procrastination, energy, mood, category, day, note)
+    if st.session_state.get("last_recorded_input") != submitted_input:
+        forecaster.update(day, category, score, weight=PREDICTION_WEIGHT)
+        save_forecaster(forecaster, forecaster_path)
+        st.session_state.last_recorded_input = submitted_input
     prog_width = f"{score}%"
 
     # choose tone and visuals with soft pastel colors
@@ -441,18 +508,8 @@ if submitted:
     st.markdown('<div class="report-card">', unsafe_allow_html=True)
     col_chart, col_stats = st.columns([1,1], gap="small")
 
-    # Prepare component approximations
-    p_map = {'Low':80, 'Medium':50, 'High':20}
-    e_map = {'Low':20, 'Medium':50, 'High':80}
-    m_map = {'Bad':20, 'Okay':50, 'Good':80}
-    components = [
-        max(0, min(100, int(100 - (duration / max(duration,60)) * 20))),  # shorter -> higher
-        p_map.get(procrastination, 50),
-        e_map.get(energy, 50),
-        m_map.get(mood, 50)
-    ]
-    comp_names = ['Duration', 'Procrastination', 'Energy', 'Mood']
-    comp_colors = [GOOD_COLOR, OK_COLOR, GOOD_COLOR, GOOD_COLOR]
+    # Component bars: how many points each field added to / took from the score
+    comp_colors = [GOOD_COLOR_ACCENT if v >= 0 else BAD_COLOR_ACCENT for v in components]
 
     # Donut chart (productivity percentage)
     with col_chart:
@@ -474,21 +531,21 @@ if submitted:
         st.pyplot(fig1)
         plt.close(fig1)
 
-    # Horizontal bars showing component approximations
+    # Horizontal bars showing per-field contributions (points, centred on zero)
     with col_stats:
         fig2, ax2 = plt.subplots(figsize=(4, 3.0), dpi=100)
         y_pos = list(range(len(comp_names)))
         ax2.barh(y_pos, components, color=comp_colors, edgecolor='white')
+        ax2.axvline(0, color='#e8dccf', linewidth=1)
         ax2.set_yticks(y_pos)
         ax2.set_yticklabels(comp_names)
-        ax2.set_xlim(0, 100)
+        reach = max(20, max(abs(v) for v in components) * 1.35)
+        ax2.set_xlim(-reach, reach)
         ax2.invert_yaxis()
         for i, v in enumerate(components):
-            # place percentage inside or beside bar depending on width
-            if v > 18:
-                ax2.text(v - 6, i, f"{v}%", va='center', ha='right', color='white', fontsize=9, fontweight='700')
-            else:
-                ax2.text(v + 2, i, f"{v}%", va='center', ha='left', color='#4e3f36', fontsize=9, fontweight='700')
+            # label just past the end of the bar
+            ax2.text(v + (1 if v >= 0 else -1), i, f"{v:+.0f}", va='center', ha='left' if v >= 0 else 'right',
+                     color='#4e3f36', fontsize=9, fontweight='700')
         ax2.xaxis.set_visible(False)
         plt.box(False)
         plt.tight_layout()
@@ -578,10 +635,114 @@ if submitted:
         """, unsafe_allow_html=True
     )
 
+    # What-if explorer: the whole grid for this procrastination/category at once
+    st.markdown('<h2 class="section-title">What if?</h2>', unsafe_allow_html=True)
+    heatmap_png, best_label, best_score = whatif_heatmap(procrastination, category, day, note)
+    st.image(heatmap_png, width="stretch")
+    st.markdown(
+        f"""<div style="color:var(--muted); font-size:13px;">Scores for <strong style="color:var(--text)">{category}</strong> tasks with <strong style="color:var(--text)">{procrastination}</strong> procrastination ({SCORE_SOURCE}). Best window: <strong style="color:var(--text)">{best_label}</strong> ({best_score}%).</div>""",
+        unsafe_allow_html=True,
+    )
+
     # light celebration for very high score
     if score >= 95:
         st.balloons()
 
+# ---------------------------
+# Forecast: expected productivity for the coming week, from this user's saved records
+# ---------------------------
+st.markdown('<h2 class="section-title">Your week ahead</h2>', unsafe_allow_html=True)
+with st.form(key="outcome_form"):
+    st.markdown('<div class="field-label">📓 How did a task actually go?</div>', unsafe_allow_html=True)
+    out_day_col, out_cat_col, out_score_col = st.columns([1, 1, 2], gap="small")
+    with out_day_col:
+        outcome_day = st.selectbox("Day", DAYS, index=datetime.now().weekday(), key="outcome_day")
+    with out_cat_col:
+        outcome_category = st.selectbox("Category", CATEGORIES, key="outcome_category")
+    with out_score_col:
+        outcome_score = st.slider("Productivity (%)", 0, 100, 60, step=5, key="outcome_score")
+    if st.form_submit_button("Log outcome"):
+        forecaster.update(outcome_day, outcome_category, outcome_score)
+        save_forecaster(forecaster, forecaster_path)
+
+if forecaster.n_records:
+    st.dataframe(
+        forecaster.forecast(),
+        width="stretch",
+        column_config={c: st.column_config.ProgressColumn(c, min_value=0, max_value=100, format="%d%%") for c in CATEGORIES},
+    )
+    st.markdown(
+        f'<div style="color:var(--muted); font-size:13px;">Based on {forecaster.n_records} recorded prediction(s) and outcome(s); logged outcomes and recent records count most. Your history is saved under this page link — bookmark it to come back to it.</div>',
+        unsafe_allow_html=True,
+    )
+else:
+    st.markdown(
+        '<div style="color:var(--muted); font-size:13px;">Make a prediction or log an outcome to start your personal forecast.</div>',
+        unsafe_allow_html=True,
+    )
+
+# ---------------------------
+# Weekly planner: schedule a list of tasks into the week's slots
+# ---------------------------
+st.markdown('<h2 class="section-title">Plan your week</h2>', unsafe_allow_html=True)
+st.markdown(
+    f'<div style="color:var(--muted); font-size:13px; margin-bottom:8px;">List your tasks and how your energy and mood usually feel in each slot — Prodawn places every task where it is predicted to go best (scored by the {SCORE_SOURCE}).</div>',
+    unsafe_allow_html=True,
+)
+if "planner_tasks" not in st.session_state:
+    st.session_state.planner_tasks = pd.DataFrame(
+        [("Write report", 60, "Work", "Medium"), ("Sketch ideas", 30, "Creative", "Low"), ("Groceries", 45, "Errand", "High")],
+        columns=TASK_COLUMNS,
+    )
+    st.session_state.planner_slots = default_slots()
+
+plan_tasks_col, plan_slots_col = st.columns([1, 1], gap="large")
+with plan_tasks_col:
+    st.markdown('<div class="field-label">📝 Tasks</div>', unsafe_allow_html=True)
+    planner_tasks = st.data_editor(
+        st.session_state.planner_tasks,
+        num_rows="dynamic",
+        hide_index=True,
+        key="planner_tasks_editor",
+        column_config={
+            "task": st.column_config.TextColumn("Task", required=True),
+            "duration": st.column_config.NumberColumn("Minutes", min_value=1, max_value=24*60, step=5, required=True),
+            "category": st.column_config.SelectboxColumn("Category", options=CATEGORIES, required=True),
+            "procrastination": st.column_config.SelectboxColumn("Procrastination", options=PROCRASTINATION_LEVELS, required=True),
+        },
+    )
+with plan_slots_col:
+    st.markdown('<div class="field-label">📅 Energy & mood per slot</div>', unsafe_allow_html=True)
+    planner_slots = st.data_editor(
+        st.session_state.planner_slots,
+        num_rows="dynamic",
+        hide_index=True,
+        key="planner_slots_editor",
+        column_config={
+            "day": st.column_config.SelectboxColumn("Day", options=DAYS, required=True),
+            "period": st.column_config.TextColumn("Slot", required=True),
+            "energy": st.column_config.SelectboxColumn("Energy", options=ENERGY_LEVELS, required=True),
+            "mood": st.column_config.SelectboxColumn("Mood", options=MOOD_LEVELS, required=True),
+        },
+    )
+
+if st.button("Plan my week 📅", key="plan_week"):
+    plan = plan_week(planner_tasks.dropna(), planner_slots.dropna(), model, X_columns)
+    st.dataframe(
+        plan,
+        hide_index=True,
+        width="stretch",
+        column_config={
+            "score": st.column_config.ProgressColumn("Predicted", min_value=0, max_value=100, format="%d%%"),
+        },
+    )
+    unplanned = int(plan["day"].isna().sum())
+    if unplanned:
+        st.markdown(
+            f'<div style="color:var(--muted); font-size:13px;">{unplanned} task(s) did not fit — add more slots to schedule them.</div>',
+            unsafe_allow_html=True,
+        )
+
 # Footer
 st.markdown(
     """
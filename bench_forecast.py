@@ -0,0 +1,47 @@
+# bench_forecast.py
+# Latency of ProductivityForecaster (forecast.py) as the record history grows.
+# Run: python bench_forecast.py
+#
+# Records are streamed into one forecaster; at each checkpoint the cost of a single
+# update and of a full week forecast is measured. Both should stay flat because the
+# state is a fixed set of weighted means, whatever the history length.
+
+import time
+import timeit
+
+import numpy as np
+
+from forecast import ProductivityForecaster
+from scoring import CATEGORIES, DAYS
+
+CHECKPOINTS = (100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    total = CHECKPOINTS[-1]
+    days = rng.choice(DAYS, total)
+    categories = rng.choice(CATEGORIES, total)
+    scores = rng.integers(0, 101, total)
+
+    forecaster = ProductivityForecaster()
+    print(f"{'history':>10}{'update us':>12}{'matrix us':>12}{'week table us':>15}")
+    done = 0
+    for checkpoint in CHECKPOINTS:
+        for i in range(done, checkpoint):
+            forecaster.update(days[i], categories[i], scores[i])
+        done = checkpoint
+
+        # time a batch of further updates; they just extend the history
+        n = 2_000
+        start = time.perf_counter()
+        for j in range(n):
+            forecaster.update(days[j], categories[j], scores[j])
+        update_us = (time.perf_counter() - start) / n * 1e6
+        matrix_us = min(timeit.repeat(forecaster.forecast_matrix, number=2_000, repeat=3)) / 2_000 * 1e6
+        table_us = min(timeit.repeat(forecaster.forecast, number=200, repeat=3)) / 200 * 1e6
+        print(f"{checkpoint:>10,}{update_us:>12.2f}{matrix_us:>12.2f}{table_us:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# bench_notes.py
+# Benchmark for the quick-note features (notes.py) and the scoring paths that use them.
+# Run: python bench_notes.py
+#
+# 1. Note hashing alone: one note (hash_note, used per request) for a typical note and
+#    very long pasted text (capped at MAX_NOTE_CHARS / MAX_NOTE_TOKENS), and bulk hash_notes.
+# 2. Scoring with a forest trained on a synthetic log: one request (encode_task, then
+#    predict_proba and the app's explain_task) and N-row batches (encode_tasks + predict_proba).
+
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from explain import ForestExplainer, explain_task
+from model import encode_task, encode_tasks, train_forest
+from notes import MAX_NOTE_CHARS, MAX_NOTE_TOKENS, NOTE_FEATURES, hash_note, hash_notes
+from scoring import CATEGORIES, DAYS, ENERGY_LEVELS, MOOD_LEVELS, PROCRASTINATION_LEVELS, compute_scores
+
+SHORT_NOTE = "Finish the quarterly report draft, then email Sam the numbers"
+LONG_NOTE = "outline chapter three and collect references for the literature review " * 2000
+BULK_SIZES = (1_000, 10_000, 100_000)
+TRAIN_ROWS = 3_000
+N_ESTIMATORS = 200
+
+
+def per_call_us(fn, number):
+    # best of 5 repeats, in microseconds per call
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def synthetic_log(n, rng):
+    words = (SHORT_NOTE + " " + LONG_NOTE[:200]).split()
+    log = pd.DataFrame({
+        "duration": rng.integers(5, 240, n),
+        "procrastination": rng.choice(PROCRASTINATION_LEVELS, n),
+        "energy": rng.choice(ENERGY_LEVELS, n),
+        "mood": rng.choice(MOOD_LEVELS, n),
+        "category": rng.choice(CATEGORIES, n),
+        "day": rng.choice(DAYS, n),
+        "note": [" ".join(rng.choice(words, rng.integers(0, 20))) for _ in range(n)],
+    })
+    score = compute_scores(log["duration"], log["procrastination"], log["energy"], log["mood"], log["category"])
+    log["productive"] = (score + rng.normal(0, 10, n) > 60).astype(int)
+    return log
+
+
+def main():
+    rng = np.random.default_rng(0)
+
+    print(f"features={NOTE_FEATURES}  max_chars={MAX_NOTE_CHARS}  max_tokens={MAX_NOTE_TOKENS}")
+    print(f"{'note hashing':<34}{'chars':>10}{'us/note':>12}")
+    for name, note in (("hash_note empty", ""), ("hash_note short", SHORT_NOTE), ("hash_note long", LONG_NOTE)):
+        us = per_call_us(lambda: hash_note(note), number=20_000)
+        print(f"{name:<34}{len(note):>10}{us:>12.2f}")
+
+    print()
+    print(f"{'bulk hash_notes':<34}{'notes':>10}{'us/note':>12}{'notes/s':>14}")
+    for size in BULK_SIZES:
+        notes = synthetic_log(size, rng)["note"].tolist()
+        seconds = min(timeit.repeat(lambda: hash_notes(notes), number=1, repeat=3))
+        print(f"{'':<34}{size:>10}{seconds / size * 1e6:>12.2f}{size / seconds:>14,.0f}")
+
+    model, columns = train_forest(synthetic_log(TRAIN_ROWS, rng), n_estimators=N_ESTIMATORS)
+    explainer = ForestExplainer(model, columns)
+    request = (60, "Medium", "High", "Good", "Work", "Tuesday", SHORT_NOTE)
+    X1 = encode_task(*request, columns=columns)
+
+    print()
+    print(f"single request, forest of {N_ESTIMATORS} trees")
+    print(f"{'step':<34}{'us':>12}")
+    print(f"{'encode_task (short note)':<34}{per_call_us(lambda: encode_task(*request, columns=columns), 20_000):>12.2f}")
+    long_request = request[:-1] + (LONG_NOTE,)
+    print(f"{'encode_task (long note)':<34}{per_call_us(lambda: encode_task(*long_request, columns=columns), 20_000):>12.2f}")
+    print(f"{'predict_proba':<34}{per_call_us(lambda: model.predict_proba(X1), 50):>12.2f}")
+    print(f"{'explain_task (app path)':<34}{per_call_us(lambda: explain_task(explainer, *request), 50):>12.2f}")
+    print(f"{'explain_task (heuristic)':<34}{per_call_us(lambda: explain_task(None, *request), 2_000):>12.2f}")
+
+    print()
+    print(f"{'bulk scoring':<34}{'rows':>10}{'encode us/row':>15}{'predict us/row':>16}{'rows/s':>12}")
+    for size in BULK_SIZES:
+        tasks = synthetic_log(size, rng)
+        encode_s = min(timeit.repeat(lambda: encode_tasks(tasks, columns), number=1, repeat=3))
+        X = encode_tasks(tasks, columns)
+        predict_s = min(timeit.repeat(lambda: model.predict_proba(X), number=1, repeat=3))
+        total = encode_s + predict_s
+        print(f"{'':<34}{size:>10}{encode_s / size * 1e6:>15.2f}{predict_s / size * 1e6:>16.2f}{size / total:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
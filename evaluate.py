@@ -0,0 +1,214 @@
+# evaluate.py
+# Compare the heuristic compute_score with trained forests on a labelled task log.
+#
+# Run: python evaluate.py task_log.csv
+#      python evaluate.py task_log.csv --forest n_estimators=100 --forest n_estimators=300,max_depth=8
+#
+# The log is read and encoded once; features, labels, heuristic scores and fold ids
+# are cached as .npy files under --cache-dir (keyed by the log contents, fold
+# settings and the scoring / encoding tables) and memory-mapped by the worker processes. Every candidate x fold runs
+# as its own job in a process pool. Forests are fitted with model.fit_forest, the
+# same code that trains the shipped model. The report has quality (accuracy, Brier
+# score, expected calibration error) next to serving cost, both timed from raw form
+# fields the way the app serves them: single-task latency through explain_task
+# (encode_task + forest walk, or the heuristic) and batch throughput through
+# encode_tasks + predict (predict_scores, or compute_scores for the heuristic).
+# Latency is measured while other jobs run; use --workers 1 for quieter timings.
+
+import argparse
+import ast
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold
+
+from explain import ForestExplainer, explain_task
+
+from model import (
+    ENERGY_VALUES, FEATURE_COLUMNS, MODEL_CATEGORIES, MOOD_VALUES, PROCRASTINATION_MINUTES, encode_tasks, fit_forest,
+    predict_scores, read_log,
+)
+from notes import MAX_NOTE_CHARS, MAX_NOTE_TOKENS, NOTE_FEATURES
+from scoring import (
+    BASE_SCORE, CREATIVE_GOOD_MOOD_BONUS, DAYS, DURATION_BREAKS, DURATION_POINTS, ENERGY_POINTS, MOOD_POINTS,
+    PROCRASTINATION_POINTS, compute_scores,
+)
+
+CACHE_DIR = ".eval_cache"
+# Bump when the cached files or how they are computed change in a way the tables below miss
+CACHE_VERSION = 2
+HEURISTIC = "heuristic"
+DEFAULT_FORESTS = ("n_estimators=100", "n_estimators=200", "n_estimators=300,max_depth=8")
+RAW_FIELDS = ("duration", "procrastination", "energy", "mood", "category", "day", "note")
+HEURISTIC_FIELDS = RAW_FIELDS[:5]
+LATENCY_CALLS = 50
+CALIBRATION_BINS = 10
+
+
+# ---------------------------
+# Fold cache
+# ---------------------------
+def prepare_folds(log_path, n_folds=5, seed=42, cache_dir=CACHE_DIR):
+    """Encode the log once and store it for memory-mapping; returns the cache folder.
+
+    Reuses an existing folder only when the log, fold settings and everything that
+    shapes the cached arrays (heuristic points, feature encoding, note hashing) match.
+    """
+    with open(log_path, "rb") as f:
+        digest = hashlib.sha1(f.read())
+    digest.update(f"{CACHE_VERSION}|{n_folds}|{seed}|{_encoding_fingerprint()}".encode())
+    path = os.path.join(cache_dir, digest.hexdigest()[:16])
+    if os.path.exists(os.path.join(path, "folds.npy")):
+        return path
+
+    log = read_log(log_path)
+    y = log["productive"].astype(np.int8).to_numpy()
+    folds = np.empty(len(log), dtype=np.int8)
+    splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed)
+    for k, (_, test) in enumerate(splitter.split(np.zeros(len(y)), y)):
+        folds[test] = k
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "X.npy"), encode_tasks(log))
+    np.save(os.path.join(path, "y.npy"), y)
+    np.save(os.path.join(path, "heuristic.npy"), compute_scores(*(log[f].to_numpy() for f in HEURISTIC_FIELDS)))
+    # notes past MAX_NOTE_CHARS are never read, so trimming keeps the fixed-width array small
+    log["note"] = log["note"].astype(str).str.slice(0, MAX_NOTE_CHARS)
+    for field in RAW_FIELDS:
+        np.save(os.path.join(path, f"raw_{field}.npy"), log[field].to_numpy(dtype=None if field == "duration" else str))
+    # written last: its presence marks the cache as complete
+    np.save(os.path.join(path, "folds.npy"), folds)
+    return path
+
+
+def _encoding_fingerprint():
+    """Text covering the scoring and encoding tables the cached arrays depend on."""
+    return repr((
+        BASE_SCORE, DURATION_BREAKS, DURATION_POINTS, PROCRASTINATION_POINTS, ENERGY_POINTS, MOOD_POINTS,
+        CREATIVE_GOOD_MOOD_BONUS, PROCRASTINATION_MINUTES, ENERGY_VALUES, MOOD_VALUES, MODEL_CATEGORIES,
+        FEATURE_COLUMNS, DAYS, NOTE_FEATURES, MAX_NOTE_CHARS, MAX_NOTE_TOKENS,
+    ))
+
+
+def _load(path, name):
+    return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+
+
+# ---------------------------
+# Metrics
+# ---------------------------
+def calibration_error(y, proba, bins=CALIBRATION_BINS):
+    """Expected calibration error: |mean predicted - observed rate| per probability bin, weighted by bin size."""
+    idx = np.minimum((proba * bins).astype(int), bins - 1)
+    predicted = np.bincount(idx, weights=proba, minlength=bins)
+    observed = np.bincount(idx, weights=y, minlength=bins)
+    return float(np.abs(predicted - observed).sum() / len(y))
+
+
+def _median_latency_us(fn, calls=LATENCY_CALLS):
+    times = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1e6)
+
+
+# ---------------------------
+# One candidate on one fold (runs in a worker process)
+# ---------------------------
+def evaluate_fold(path, name, params, fold):
+    folds = _load(path, "folds")
+    test = np.flatnonzero(folds == fold)
+    y_test = np.asarray(_load(path, "y")[test], dtype=float)
+    tasks = pd.DataFrame({f: np.asarray(_load(path, f"raw_{f}")[test]) for f in RAW_FIELDS})
+    first = tasks.iloc[0].tolist()
+
+    if name == HEURISTIC:
+        proba = np.asarray(_load(path, "heuristic")[test], dtype=float) / 100
+        explainer = None
+        def score_batch():
+            return compute_scores(*(tasks[f].to_numpy() for f in HEURISTIC_FIELDS))
+    else:
+        X = _load(path, "X")
+        train = np.flatnonzero(folds != fold)
+        # one core per job unless the spec says otherwise: the pool already runs a job per CPU
+        model = fit_forest(X[train], _load(path, "y")[train], **{"n_jobs": 1, **params})
+        proba = model.predict_proba(np.asarray(X[test]))[:, list(model.classes_).index(1)]
+        explainer = ForestExplainer(model, FEATURE_COLUMNS)
+        def score_batch():
+            return predict_scores(model, FEATURE_COLUMNS, tasks)
+
+    latency = _median_latency_us(lambda: explain_task(explainer, *first))
+    start = time.perf_counter()
+    score_batch()
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "candidate": name,
+        "fold": fold,
+        "accuracy": float(((proba >= 0.5) == y_test).mean()),
+        "brier": float(np.mean((proba - y_test) ** 2)),
+        "ece": calibration_error(y_test, proba),
+        "latency_us": latency,
+        "throughput_per_s": len(test) / batch_seconds if batch_seconds > 0 else float("inf"),
+    }
+
+
+def parse_forest(spec):
+    """'n_estimators=300,max_features=0.5' -> ('forest n_estimators=300,max_features=0.5', {...}).
+
+    Values are Python literals (ints, floats, None, quoted strings); anything else
+    is kept as a string, e.g. max_features=sqrt.
+    """
+    params = {}
+    for item in filter(None, spec.split(",")):
+        key, value = item.split("=", 1)
+        try:
+            params[key.strip()] = ast.literal_eval(value.strip())
+        except (ValueError, SyntaxError):
+            params[key.strip()] = value.strip()
+    params.setdefault("random_state", 42)
+    return f"forest {spec}", params
+
+
+def evaluate(log_path, forests=DEFAULT_FORESTS, n_folds=5, seed=42, workers=None, cache_dir=CACHE_DIR):
+    """Evaluate the heuristic and each forest spec; returns a per-candidate summary frame."""
+    path = prepare_folds(log_path, n_folds=n_folds, seed=seed, cache_dir=cache_dir)
+    candidates = [(HEURISTIC, {})] + [parse_forest(spec) for spec in forests]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [pool.submit(evaluate_fold, path, name, params, fold)
+                for name, params in candidates for fold in range(n_folds)]
+        results = pd.DataFrame([job.result() for job in jobs])
+    summary = results.drop(columns="fold").groupby("candidate", sort=False).agg(
+        accuracy=("accuracy", "mean"),
+        accuracy_std=("accuracy", "std"),
+        brier=("brier", "mean"),
+        ece=("ece", "mean"),
+        latency_us=("latency_us", "median"),
+        throughput_per_s=("throughput_per_s", "median"),
+    )
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the heuristic and trained forests on a task log.")
+    parser.add_argument("log", help="labelled task log (CSV)")
+    parser.add_argument("--forest", action="append", dest="forests",
+                        help="forest settings, e.g. n_estimators=300,max_depth=8 (repeatable)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--csv", help="also write the summary to this CSV file")
+    args = parser.parse_args()
+
+    summary = evaluate(args.log, forests=args.forests or DEFAULT_FORESTS, n_folds=args.folds,
+                       seed=args.seed, workers=args.workers, cache_dir=args.cache_dir)
+    print(summary.to_string(float_format="{:,.4f}".format))
+    if args.csv:
+        summary.to_csv(args.csv)
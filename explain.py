@@ -0,0 +1,118 @@
+# explain.py
+# Per-field contributions behind a score, for the component bars in app.py.
+#
+# Heuristic: the score is BASE_SCORE plus the points from each field (scoring.score_parts),
+# so those points are exact contributions. If the total is clamped at 0 / 100 the
+# points are scaled so they still add up to score - BASE_SCORE.
+#
+# Forest: path-based (Saabas) contributions. Walking a tree from root to leaf, every
+# split moves the productive-class probability from the parent node's value to the
+# child's; that change is credited to the split feature's field. Each tree's root-to-node
+# sums are precomputed once per model as a node x field table, so explaining a row only
+# needs the leaf it lands in per tree (tree_.apply) and a sum of those table rows.
+
+import numpy as np
+
+from model import encode_task
+from scoring import BASE_SCORE, SCORE_PARTS, compute_score, score_parts
+
+MODEL_FIELDS = SCORE_PARTS + ("Day", "Note")
+COLUMN_FIELDS = {
+    "task_duration": "Duration",
+    "procrastination_time": "Procrastination",
+    "energy_level": "Energy",
+    "mood_level": "Mood",
+    "category_": "Category",
+    "day_of_week_": "Day",
+    "note_": "Note",
+}
+
+
+def heuristic_contributions(duration, procrastination, energy, mood, category):
+    """Points per SCORE_PARTS field for the heuristic score; arguments broadcast like compute_scores.
+
+    Returns (base, contributions) with contributions.sum(-1) == compute_scores(...) - base.
+    """
+    parts = score_parts(duration, procrastination, energy, mood, category).astype(float)
+    raw = parts.sum(axis=-1, keepdims=True)
+    clamped = np.clip(BASE_SCORE + raw, 0, 100) - BASE_SCORE
+    scale = np.divide(clamped, raw, out=np.ones_like(raw), where=raw != 0)
+    return BASE_SCORE, parts * scale
+
+
+def _field_of(column):
+    for prefix, field in COLUMN_FIELDS.items():
+        if column == prefix or (prefix.endswith("_") and column.startswith(prefix)):
+            return field
+    return None
+
+
+class ForestExplainer:
+    """Path-based contributions for a fitted RandomForestClassifier, grouped by form field.
+
+    Build once per model (the setup walks every tree), then call ``explain`` for
+    any number of encoded rows.
+    """
+
+    def __init__(self, model, columns, positive_class=1):
+        self.model = model
+        self.columns = list(columns)
+        cls = list(model.classes_).index(positive_class)
+
+        fields = [_field_of(c) for c in self.columns]
+        self.fields = [f for f in MODEL_FIELDS if f in fields]
+        # field column per feature; features without a field go to a scratch column that is dropped
+        field_of_feature = np.array([self.fields.index(f) if f else len(self.fields) for f in fields])
+
+        n_trees = len(model.estimators_)
+        tables, roots = [], []
+        for est in model.estimators_:
+            tree = est.tree_
+            value = tree.value[:, 0, :]
+            proba = value[:, cls] / value.sum(axis=1)
+            # cumulative root-to-node contribution per field, filled one depth level at a time
+            table = np.zeros((tree.node_count, len(self.fields) + 1))
+            level = np.array([0])
+            while level.size:
+                level = level[tree.children_left[level] >= 0]
+                column = field_of_feature[tree.feature[level]]
+                for children in (tree.children_left[level], tree.children_right[level]):
+                    table[children] = table[level]
+                    table[children, column] += proba[children] - proba[level]
+                level = np.concatenate((tree.children_left[level], tree.children_right[level]))
+            tables.append(table[:, :-1] / n_trees)
+            roots.append(proba[0])
+
+        self.bias = float(np.mean(roots))
+        # All trees' tables stacked; tree t's node i is row _offsets[t] + i
+        self._paths = np.concatenate(tables)
+        self._offsets = np.cumsum([0] + [len(t) for t in tables[:-1]])
+
+    def explain(self, X):
+        """(bias, contributions) in probability units; contributions has one column per ``self.fields``.
+
+        bias + contributions.sum(1) equals model.predict_proba(X)[:, positive_class].
+        Each tree finds the leaf of every row (tree_.apply) and the leaves' rows of
+        the precomputed tables are summed, so this costs about as much as a predict
+        with n_jobs=1.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        leaves = np.column_stack([est.tree_.apply(X) for est in self.model.estimators_])
+        return self.bias, self._paths[leaves + self._offsets].sum(axis=1)
+
+
+def explain_task(explainer, duration, procrastination, energy, mood, category, day, note=""):
+    """(score, field names, contributions in score points) for one form input.
+
+    This is the app's per-request path. With a ForestExplainer the score comes from
+    the same tree walk as the contributions (bias + contributions is the forest's
+    probability), so no separate predict is needed. With ``explainer=None`` the
+    heuristic is used.
+    """
+    if explainer is None:
+        _, parts = heuristic_contributions(duration, procrastination, energy, mood, category)
+        return compute_score(duration, procrastination, energy, mood, category), list(SCORE_PARTS), parts.tolist()
+    X = encode_task(duration, procrastination, energy, mood, category, day, note, columns=explainer.columns)
+    bias, contributions = explainer.explain(X)
+    score = int(np.clip(np.rint((bias + contributions[0].sum()) * 100), 0, 100))
+    return score, explainer.fields, (contributions[0] * 100).tolist()
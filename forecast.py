@@ -0,0 +1,150 @@
+# forecast.py
+# Personal productivity forecast for the coming days, by weekday and category.
+#
+# Each recorded score updates exponentially weighted means at three levels: overall,
+# per weekday and per weekday x category. An update touches one cell
+# of each level (older records decay on a shared clock, applied lazily per cell),
+# so it is O(1) and the history itself is never kept or refit. The clock advances by
+# each record's weight, so a down-weighted record also ages the history less.
+# A forecast starts from the weekday mean (shrunk toward the overall mean), adds the
+# category effect measured on what is left after the weekday (so a category that is
+# mostly done on one weekday is not counted twice), then moves toward the cell's own
+# mean as that cell collects records. It never leaves the range of recorded scores.
+#
+# The state is a handful of small arrays; save_forecaster / load_forecaster keep one
+# file per user under FORECAST_DIR so the history survives page reloads.
+
+import os
+import re
+from datetime import date, timedelta
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from scoring import BASE_SCORE, CATEGORIES, DAYS
+
+DAY_INDEX = {d: i for i, d in enumerate(DAYS)}
+CATEGORY_INDEX = {c: i for i, c in enumerate(CATEGORIES)}
+FORECAST_DIR = ".forecasts"
+USER_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+class _EWMean:
+    """Exponentially weighted means for an array of keys, all decayed on one shared record clock.
+
+    Decay is applied lazily: each key remembers the clock value of its last update
+    and catches up on the decay it missed when it is next touched or read. The clock
+    is a float: it advances by each record's weight.
+    """
+
+    def __init__(self, shape, keep):
+        self.keep = keep
+        self.sum = np.zeros(shape)
+        self.weight = np.zeros(shape)
+        self.last = np.zeros(shape)
+
+    def update(self, idx, value, weight, now):
+        decay = self.keep ** (now - self.last[idx])
+        self.sum[idx] = decay * self.sum[idx] + weight * value
+        self.weight[idx] = decay * self.weight[idx] + weight
+        self.last[idx] = now
+
+    def mean(self, fallback):
+        # decay since the last update cancels out of sum / weight
+        out = np.broadcast_to(np.asarray(fallback, dtype=float), self.sum.shape).copy()
+        seen = self.weight > 0
+        out[seen] = self.sum[seen] / self.weight[seen]
+        return out
+
+    def n_eff(self, now):
+        # weighted record count, decayed to ``now``; a key without new records fades out
+        return self.weight * self.keep ** (now - self.last)
+
+
+class ProductivityForecaster:
+    """Incremental forecaster for one user.
+
+    ``halflife`` is the number of records, of any weekday or category, after which
+    a record's weight halves, at every level; a weekday or category that stops
+    getting records loses influence as the rest of the history moves on. Records
+    are counted by weight, so four 0.25-weight records age the history like one.
+    ``n_records`` counts the records themselves.
+    ``prior_strength`` is how many records a weekday / category / cell needs
+    before its own mean counts as much as the level above it.
+    """
+
+    def __init__(self, halflife=20, prior_strength=3.0, prior=BASE_SCORE):
+        keep = 0.5 ** (1.0 / halflife)
+        self.prior = prior
+        self.prior_strength = prior_strength
+        self.n_records = 0
+        self.clock = 0.0
+        self.low = self.high = None
+        self._overall = _EWMean((), keep)
+        self._day = _EWMean(len(DAYS), keep)
+        self._cell = _EWMean((len(DAYS), len(CATEGORIES)), keep)
+
+    def update(self, day, category, score, weight=1.0):
+        """Record one score; ``weight`` < 1 makes it count as a fraction of a record."""
+        d = DAY_INDEX[day]
+        c = CATEGORY_INDEX[category]
+        self.n_records += 1
+        self.clock += weight
+        now = self.clock
+        self.low = score if self.low is None else min(self.low, score)
+        self.high = score if self.high is None else max(self.high, score)
+        self._overall.update((), score, weight, now)
+        self._day.update(d, score, weight, now)
+        self._cell.update((d, c), score, weight, now)
+
+    def _shrink(self, level):
+        n = level.n_eff(self.clock)
+        return n / (n + self.prior_strength)
+
+    def forecast_matrix(self):
+        """Forecast score for every weekday x category, shape (len(DAYS), len(CATEGORIES))."""
+        overall = float(self._overall.mean(self.prior))
+        day = overall + (self._day.mean(overall) - overall) * self._shrink(self._day)
+        # category effect: weighted mean of the cells' residuals against their weekday
+        n = self._cell.n_eff(self.clock)
+        cell = self._cell.mean(day[:, None])
+        n_category = n.sum(axis=0)
+        residual = (n * (cell - day[:, None])).sum(axis=0)
+        category_effect = residual / (n_category + self.prior_strength)
+        additive = day[:, None] + category_effect[None, :]
+        w = self._shrink(self._cell)
+        forecast = w * cell + (1 - w) * additive
+        if self.low is None:
+            return forecast
+        return np.clip(forecast, self.low, self.high)
+
+    def forecast(self, start=None, days=7):
+        """Forecast table for ``days`` days from ``start`` (default today): one row per date, one column per category."""
+        start = start or date.today()
+        dates = [start + timedelta(days=i) for i in range(days)]
+        matrix = self.forecast_matrix()
+        rows = np.rint(matrix[[d.weekday() for d in dates]]).astype(int)
+        index = pd.Index([f"{DAYS[d.weekday()][:3]} {d:%d %b}" for d in dates], name="day")
+        return pd.DataFrame(rows, index=index, columns=list(CATEGORIES))
+
+
+def forecast_path(user, directory=FORECAST_DIR):
+    """File holding ``user``'s forecast state; ``user`` must match USER_ID (it becomes a file name)."""
+    if not USER_ID.fullmatch(user):
+        raise ValueError(f"invalid user id: {user!r}")
+    return os.path.join(directory, f"{user}.pkl")
+
+
+def save_forecaster(forecaster, path):
+    # write to a temporary file first so a concurrent reader never sees a partial pickle
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    joblib.dump(forecaster, f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+
+
+def load_forecaster(path):
+    """The saved forecaster, or a new one when ``path`` does not exist yet."""
+    if not os.path.exists(path):
+        return ProductivityForecaster()
+    return joblib.load(path)
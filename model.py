@@ -0,0 +1,181 @@
+# model.py
+# Trained-model path: encode form fields into the model's feature columns, train a
+# RandomForest on a labelled task log, and load / save it with joblib.
+#
+# Train: python model.py task_log.csv
+# The log is a CSV with the LOG_COLUMNS below (productive is 0/1). Training writes
+# productivity_model.pkl and columns.pkl, which app.py picks up on its next start.
+
+import argparse
+import itertools
+import os
+from functools import lru_cache
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from notes import NOTE_COLUMNS, hash_note, hash_notes
+from scoring import DAYS, DURATION_OPTIONS, ENERGY_LEVELS, MOOD_LEVELS
+
+MODEL_PATH = "productivity_model.pkl"
+COLUMNS_PATH = "columns.pkl"
+
+LOG_COLUMNS = ["duration", "procrastination", "energy", "mood", "category", "day", "note", "productive"]
+
+# ---------------------------
+# Form labels -> training features (same encoding as the original training notebook)
+# ---------------------------
+PROCRASTINATION_MINUTES = {"Low": 5, "Medium": 15, "High": 30}
+ENERGY_VALUES = {"Low": 3, "Medium": 5, "High": 8}
+MOOD_VALUES = {"Bad": 1, "Okay": 3, "Good": 5}
+# The notebook's categories; "Creative" was the dropped first dummy, so it is all zeros
+MODEL_CATEGORIES = {
+    "Work": "Professional",
+    "Study": "Education",
+    "Personal": "Self-Care",
+    "Errand": "Household",
+    "Creative": None,
+}
+
+NUMERIC_COLUMNS = ["task_duration", "procrastination_time", "energy_level", "mood_level"]
+CATEGORY_COLUMNS = [f"category_{c}" for c in ("Education", "Fitness", "Household", "Professional", "Self-Care")]
+DAY_COLUMNS = [f"day_of_week_{i}" for i in range(1, len(DAYS))]
+BASE_COLUMNS = NUMERIC_COLUMNS + CATEGORY_COLUMNS + DAY_COLUMNS
+FEATURE_COLUMNS = BASE_COLUMNS + NOTE_COLUMNS
+CATEGORY_INDEX = {c: CATEGORY_COLUMNS.index(f"category_{m}") for c, m in MODEL_CATEGORIES.items() if m}
+DAY_INDEX = {d: i for i, d in enumerate(DAYS)}
+CATEGORY_START = len(NUMERIC_COLUMNS)
+DAY_START = CATEGORY_START + len(CATEGORY_COLUMNS)
+
+
+@lru_cache(maxsize=8)
+def _column_positions(columns):
+    # unknown columns point at the extra all-zero slot after FEATURE_COLUMNS
+    position = {c: i for i, c in enumerate(FEATURE_COLUMNS)}
+    return np.array([position.get(c, len(FEATURE_COLUMNS)) for c in columns])
+
+
+def _select(X, columns):
+    """Drop the zero slot, or pick ``columns`` (a saved model's column list) out of X."""
+    if columns is None:
+        return X[:, :len(FEATURE_COLUMNS)]
+    return X[:, _column_positions(tuple(columns))]
+
+
+def encode_tasks(tasks, columns=None):
+    """Encode a frame of form fields (LOG_COLUMNS minus the label) into a float32 feature matrix.
+
+    Columns come out in FEATURE_COLUMNS order, or in the order of ``columns`` (the
+    list saved with a model), with zeros for columns this encoder does not produce.
+    Use encode_task for a single request; this one is for batches.
+    """
+    n = len(tasks)
+    X = np.zeros((n, len(FEATURE_COLUMNS) + 1), dtype=np.float32)
+    X[:, 0] = tasks["duration"].to_numpy(dtype=np.float32)
+    X[:, 1] = tasks["procrastination"].map(PROCRASTINATION_MINUTES).fillna(PROCRASTINATION_MINUTES["Medium"])
+    X[:, 2] = tasks["energy"].map(ENERGY_VALUES).fillna(ENERGY_VALUES["Medium"])
+    X[:, 3] = tasks["mood"].map(MOOD_VALUES).fillna(MOOD_VALUES["Okay"])
+
+    cat_idx = tasks["category"].map(CATEGORY_INDEX).fillna(-1).to_numpy(dtype=int)
+    rows = np.flatnonzero(cat_idx >= 0)
+    X[rows, CATEGORY_START + cat_idx[rows]] = 1
+
+    day_idx = tasks["day"].map(DAY_INDEX).fillna(0).to_numpy(dtype=int)
+    rows = np.flatnonzero(day_idx > 0)
+    X[rows, DAY_START + day_idx[rows] - 1] = 1
+
+    notes = tasks["note"] if "note" in tasks else [""] * n
+    X[:, len(BASE_COLUMNS):len(FEATURE_COLUMNS)] = hash_notes(notes)
+    return _select(X, columns)
+
+
+def encode_task(duration, procrastination, energy, mood, category, day, note="", columns=None):
+    """Encode one form submission into a (1, n_columns) matrix; same result as encode_tasks.
+
+    Plain dict lookups and lists, no pandas, so a single request costs microseconds.
+    """
+    row = [0.0] * (len(FEATURE_COLUMNS) + 1)
+    row[0] = float(duration)
+    row[1] = PROCRASTINATION_MINUTES.get(procrastination, PROCRASTINATION_MINUTES["Medium"])
+    row[2] = ENERGY_VALUES.get(energy, ENERGY_VALUES["Medium"])
+    row[3] = MOOD_VALUES.get(mood, MOOD_VALUES["Okay"])
+    if category in CATEGORY_INDEX:
+        row[CATEGORY_START + CATEGORY_INDEX[category]] = 1.0
+    if DAY_INDEX.get(day, 0):
+        row[DAY_START + DAY_INDEX[day] - 1] = 1.0
+    row[len(BASE_COLUMNS):len(FEATURE_COLUMNS)] = hash_note(note)
+    return _select(np.array([row], dtype=np.float32), columns)
+
+
+def read_log(path):
+    """Load a labelled task log CSV (empty notes stay empty strings)."""
+    return pd.read_csv(path, usecols=LOG_COLUMNS, keep_default_na=False)
+
+
+def fit_forest(X, y, n_estimators=200, max_depth=None, random_state=42, n_jobs=-1, **params):
+    """Fit a RandomForestClassifier on encoded features, using ``n_jobs`` cores.
+
+    The fitted model is switched to n_jobs=1 before it is returned: the app scores
+    one task at a time, where dispatching threads costs more than it saves.
+    """
+    model = RandomForestClassifier(
+        n_estimators=n_estimators, max_depth=max_depth, random_state=random_state, n_jobs=n_jobs, **params
+    )
+    model.fit(X, y)
+    model.n_jobs = 1
+    return model
+
+
+def train_forest(log, **params):
+    """Fit a forest on a task log (see fit_forest for settings); returns (model, columns)."""
+    model = fit_forest(encode_tasks(log), log["productive"].astype(int).to_numpy(), **params)
+    return model, pd.Index(FEATURE_COLUMNS)
+
+
+def save_model(model, columns, model_path=MODEL_PATH, columns_path=COLUMNS_PATH):
+    joblib.dump(model, model_path)
+    joblib.dump(columns, columns_path)
+
+
+def load_model(model_path=MODEL_PATH, columns_path=COLUMNS_PATH):
+    """(model, columns), or (None, None) when the model has not been trained yet."""
+    if not (os.path.exists(model_path) and os.path.exists(columns_path)):
+        return None, None
+    model = joblib.load(model_path)
+    # models saved before fit_forest may still carry n_jobs=-1
+    model.n_jobs = 1
+    return model, joblib.load(columns_path)
+
+
+def predict_scores(model, columns, tasks, positive_class=1):
+    """Productive-class probability as an int score 0..100 for each task.
+
+    Batched counterpart of explain.explain_task (which serves single requests);
+    both read the class by label, so the what-if grid and planner agree with it.
+    """
+    proba = model.predict_proba(encode_tasks(tasks, columns))[:, list(model.classes_).index(positive_class)]
+    return np.rint(proba * 100).astype(int)
+
+
+def predict_grid(model, columns, procrastination, category, day, note="", durations=DURATION_OPTIONS):
+    """Model version of scoring.score_grid: one batched predict, shape (durations, energy, mood)."""
+    grid = pd.DataFrame(
+        list(itertools.product(durations, ENERGY_LEVELS, MOOD_LEVELS)), columns=["duration", "energy", "mood"]
+    ).assign(procrastination=procrastination, category=category, day=day, note=note)
+    scores = predict_scores(model, columns, grid)
+    return scores.reshape(len(durations), len(ENERGY_LEVELS), len(MOOD_LEVELS))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the Prodawn productivity model.")
+    parser.add_argument("log", help="labelled task log (CSV)")
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--max-depth", type=int, default=None)
+    args = parser.parse_args()
+
+    log = read_log(args.log)
+    model, columns = train_forest(log, n_estimators=args.n_estimators, max_depth=args.max_depth)
+    save_model(model, columns)
+    print(f"Trained on {len(log)} tasks ({len(columns)} features) -> {MODEL_PATH}, {COLUMNS_PATH}")
@@ -0,0 +1,67 @@
+# notes.py
+# Quick-note text -> fixed-width feature vector, using the hashing trick.
+#
+# Tokens are hashed with crc32 (stable across processes, unlike hash()) into
+# NOTE_FEATURES signed buckets, so there is no vocabulary to fit, save or load.
+# Only the first MAX_NOTE_CHARS characters / MAX_NOTE_TOKENS tokens are read, which
+# keeps the cost of one note bounded no matter how much text is pasted in.
+
+import re
+import zlib
+
+import numpy as np
+
+NOTE_FEATURES = 32
+MAX_NOTE_CHARS = 256
+MAX_NOTE_TOKENS = 32
+NOTE_COLUMNS = [f"note_{i:02d}" for i in range(NOTE_FEATURES)]
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def _note_buckets(note, n_features):
+    """(bucket, sign) lists for one note."""
+    buckets, signs = [], []
+    if not isinstance(note, str) or not note:
+        return buckets, signs
+    for token in _TOKEN_RE.findall(note[:MAX_NOTE_CHARS].lower())[:MAX_NOTE_TOKENS]:
+        h = zlib.crc32(token.encode())
+        buckets.append(h % n_features)
+        signs.append(-1.0 if h & 0x80000000 else 1.0)
+    return buckets, signs
+
+
+def hash_note(note, n_features=NOTE_FEATURES):
+    """Features for a single note as a plain list (L2-normalized, all zeros for an empty note).
+
+    Pure Python on purpose: for one request, numpy setup costs more than the hashing.
+    """
+    vec = [0.0] * n_features
+    buckets, signs = _note_buckets(note, n_features)
+    for b, s in zip(buckets, signs):
+        vec[b] += s
+    norm = sum(v * v for v in vec) ** 0.5
+    if norm:
+        vec = [v / norm for v in vec]
+    return vec
+
+
+def hash_notes(notes, n_features=NOTE_FEATURES):
+    """Feature matrix for many notes, shape (len(notes), n_features).
+
+    Tokens are collected per note, then all rows are filled with a single
+    bincount and normalized together.
+    """
+    rows, cols, vals = [], [], []
+    n = 0
+    for n, note in enumerate(notes, start=1):
+        buckets, signs = _note_buckets(note, n_features)
+        rows.extend([n - 1] * len(buckets))
+        cols.extend(buckets)
+        vals.extend(signs)
+    flat = np.asarray(rows, dtype=np.int64) * n_features + np.asarray(cols, dtype=np.int64)
+    out = np.bincount(flat, weights=vals, minlength=n * n_features).astype(np.float64, copy=False)
+    out = out.reshape(n, n_features)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    np.divide(out, norms, out=out, where=norms > 0)
+    return out.astype(np.float32)
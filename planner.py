@@ -0,0 +1,86 @@
+# planner.py
+# Weekly planner: put each task into the time slot where it is predicted to go best.
+#
+# Every task x slot pair is scored in one broadcast call to compute_scores, then the
+# slot assignment that maximizes the total score is solved with the Hungarian method
+# (scipy's linear_sum_assignment). Each slot takes at most one task; when there are
+# more tasks than slots the lowest-value tasks stay unscheduled.
+# With a trained model, pairs are scored by one batched predict instead; slots only
+# differ by day / energy / mood, so each task is scored once per distinct combination.
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+
+from model import predict_scores
+from scoring import DAYS, compute_scores
+
+TASK_COLUMNS = ["task", "duration", "category", "procrastination"]
+SLOT_COLUMNS = ["day", "period", "energy", "mood"]
+
+# Typical energy / mood through a day; used to seed the slot table in the app
+PERIOD_PROFILE = {
+    "Morning": ("High", "Good"),
+    "Afternoon": ("Medium", "Okay"),
+    "Evening": ("Low", "Okay"),
+}
+
+
+def default_slots(days=DAYS, profile=PERIOD_PROFILE):
+    rows = [(day, period, energy, mood) for day in days for period, (energy, mood) in profile.items()]
+    return pd.DataFrame(rows, columns=SLOT_COLUMNS)
+
+
+def score_matrix(tasks, slots, model=None, columns=None):
+    """Predicted score for every task (rows) in every slot (columns), shape (n_tasks, n_slots).
+
+    Uses the heuristic, or ``model`` (with its saved ``columns``) when given; the
+    task name stands in for the quick note.
+    """
+    if model is None:
+        return compute_scores(
+            tasks["duration"].to_numpy()[:, None],
+            tasks["procrastination"].to_numpy()[:, None],
+            slots["energy"].to_numpy()[None, :],
+            slots["mood"].to_numpy()[None, :],
+            tasks["category"].to_numpy()[:, None],
+        )
+    slot_keys = ["day", "energy", "mood"]
+    codes, distinct = pd.MultiIndex.from_frame(slots[slot_keys]).factorize()
+    pairs = (
+        tasks[["duration", "category", "procrastination"]]
+        .assign(note=tasks["task"].astype(str).to_numpy())
+        .merge(distinct.to_frame(index=False, name=slot_keys), how="cross")
+    )
+    scores = predict_scores(model, columns, pairs).reshape(len(tasks), len(distinct))
+    return scores[:, codes]
+
+
+def plan_week(tasks, slots, model=None, columns=None):
+    """Assign tasks to slots to maximize the total predicted score.
+
+    Returns a copy of ``tasks`` with the chosen day, period and score added;
+    tasks that did not get a slot have empty day/period and a missing score.
+    """
+    tasks = tasks.reset_index(drop=True)
+    slots = slots.reset_index(drop=True)
+    plan = tasks.copy()
+    plan["day"] = None
+    plan["period"] = None
+    plan["score"] = pd.array([pd.NA] * len(tasks), dtype="Int64")
+    if tasks.empty or slots.empty:
+        return plan
+
+    scores = score_matrix(tasks, slots, model, columns)
+    task_idx, slot_idx = linear_sum_assignment(scores, maximize=True)
+
+    plan.loc[task_idx, "day"] = slots["day"].to_numpy()[slot_idx]
+    plan.loc[task_idx, "period"] = slots["period"].to_numpy()[slot_idx]
+    plan.loc[task_idx, "score"] = scores[task_idx, slot_idx]
+
+    # Order by the week, then by the slot order inside each day
+    day_order = {d: i for i, d in enumerate(DAYS)}
+    slot_order = np.full(len(tasks), len(slots))
+    slot_order[task_idx] = slot_idx
+    plan["_order"] = plan["day"].map(day_order).fillna(len(DAYS)) * (len(slots) + 1) + slot_order
+    return plan.sort_values("_order", kind="stable").drop(columns="_order").reset_index(drop=True)
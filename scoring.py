@@ -0,0 +1,102 @@
+# scoring.py
+# Productivity heuristic shared by app.py and the offline tools.
+#
+# The score is additive: a base value plus a few points per field, clamped to 0..100.
+# Keeping the points in lookup tables lets the same rules run for one task
+# (compute_score) or for whole numpy grids at once (compute_scores).
+
+import numpy as np
+
+# ---------------------------
+# Field options (same order as the form selectboxes)
+# ---------------------------
+DURATION_OPTIONS = (5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 240)
+PROCRASTINATION_LEVELS = ("Low", "Medium", "High")
+ENERGY_LEVELS = ("Low", "Medium", "High")
+MOOD_LEVELS = ("Bad", "Okay", "Good")
+CATEGORIES = ("Work", "Study", "Personal", "Errand", "Creative")
+DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# ---------------------------
+# Heuristic points
+# ---------------------------
+BASE_SCORE = 55
+# duration <= 15 -> +14, <= 30 -> +10, <= 60 -> +4, <= 120 -> -4, longer -> -12
+DURATION_BREAKS = (15, 30, 60, 120)
+DURATION_POINTS = (14, 10, 4, -4, -12)
+PROCRASTINATION_POINTS = {"Low": 16, "Medium": 0, "High": -18}
+ENERGY_POINTS = {"Low": -10, "Medium": 0, "High": 12}
+MOOD_POINTS = {"Bad": -6, "Okay": 0, "Good": 8}
+CREATIVE_GOOD_MOOD_BONUS = 4
+
+
+def _duration_points(duration):
+    for limit, points in zip(DURATION_BREAKS, DURATION_POINTS):
+        if duration <= limit:
+            return points
+    return DURATION_POINTS[-1]
+
+
+def compute_score(duration, procrastination, energy, mood, category):
+    score = BASE_SCORE
+    score += _duration_points(duration)
+    score += PROCRASTINATION_POINTS.get(procrastination, 0)
+    score += ENERGY_POINTS.get(energy, 0)
+    score += MOOD_POINTS.get(mood, 0)
+    if category == "Creative" and mood == "Good":
+        score += CREATIVE_GOOD_MOOD_BONUS
+    return max(0, min(100, int(score)))
+
+
+# ---------------------------
+# Vectorized version (numpy broadcasting)
+# ---------------------------
+def _lookup(points, values):
+    """Map an array of labels to their points; unknown labels score 0 like compute_score."""
+    values = np.asarray(values)
+    labels, inverse = np.unique(values, return_inverse=True)
+    table = np.array([points.get(label, 0) for label in labels], dtype=np.int16)
+    return table[inverse].reshape(values.shape)
+
+
+SCORE_PARTS = ("Duration", "Procrastination", "Energy", "Mood", "Category")
+
+
+def score_parts(duration, procrastination, energy, mood, category):
+    """Points each field adds to BASE_SCORE, before clamping; shape (..., len(SCORE_PARTS)).
+
+    Arguments broadcast like compute_scores. The Creative + Good mood bonus is
+    counted under Category.
+    """
+    duration = np.asarray(duration)
+    mood = np.asarray(mood)
+    parts = np.broadcast_arrays(
+        np.asarray(DURATION_POINTS, dtype=np.int16)[np.searchsorted(DURATION_BREAKS, duration, side="left")],
+        _lookup(PROCRASTINATION_POINTS, procrastination),
+        _lookup(ENERGY_POINTS, energy),
+        _lookup(MOOD_POINTS, mood),
+        (CREATIVE_GOOD_MOOD_BONUS * ((np.asarray(category) == "Creative") & (mood == "Good"))).astype(np.int16),
+    )
+    return np.stack(parts, axis=-1)
+
+
+def compute_scores(duration, procrastination, energy, mood, category):
+    """Array version of compute_score.
+
+    Every argument may be a scalar or an array; they are broadcast against each
+    other, so e.g. durations[:, None, None] x energy[None, :, None] x mood[None, None, :]
+    scores a full grid in one call. Returns an int16 array of scores in 0..100.
+    """
+    parts = score_parts(duration, procrastination, energy, mood, category)
+    return np.clip(BASE_SCORE + parts.sum(axis=-1), 0, 100).astype(np.int16)
+
+
+def score_grid(procrastination, category, durations=DURATION_OPTIONS):
+    """Scores for every duration x energy x mood combination, shape (durations, energy, mood)."""
+    return compute_scores(
+        np.asarray(durations)[:, None, None],
+        procrastination,
+        np.asarray(ENERGY_LEVELS)[None, :, None],
+        np.asarray(MOOD_LEVELS)[None, None, :],
+        category,
+    )